@@ -0,0 +1,87 @@
+import argparse
+import os
+import resource
+import sys
+import time
+
+# Ensure src/ is importable when running without install
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from engine.router import decide, verifier  # noqa: E402
+
+
+FACTS = [
+    # approve_no_otp
+    {"amount": 100.0, "avail": 1000.0, "limit": 5000.0, "risk": 0.2, "vel1h": 1, "mcc": 5411, "cnp": False},
+    # approve_with_otp
+    {"amount": 500.0, "avail": 450.0, "limit": 1000.0, "risk": 0.5, "vel1h": 2, "mcc": 5999, "cnp": True},
+    # decline (unsat: cnp_tightened)
+    {"amount": 200.0, "avail": 1000.0, "limit": 5000.0, "risk": 0.7, "vel1h": 1, "mcc": 5999, "cnp": True},
+]
+
+
+def facts_for(i: int) -> dict:
+    # Vary the amount so each request introduces fresh numerals into Z3
+    facts = dict(FACTS[i % len(FACTS)])
+    facts["amount"] += (i % 100_000) / 100.0
+    return facts
+
+
+# /proc gives current RSS; elsewhere only the peak is available, which can
+# hide a sawtooth but still catches unbounded growth
+PEAK_RSS_ONLY = not os.path.exists("/proc/self/statm")
+
+
+def rss_bytes() -> int:
+    if not PEAK_RSS_ONLY:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    # KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run decide() in a loop and check that RSS stays flat. "
+        "The hard path runs at roughly 200-300 decisions/s per thread, so the default "
+        "3M iterations take about 3-4 hours; use --iterations for a quicker check."
+    )
+    parser.add_argument("--iterations", type=int, default=3_000_000)
+    parser.add_argument("--warmup", type=int, default=50_000)
+    parser.add_argument("--mode", default="hard", choices=["hard", "soft"])
+    parser.add_argument("--max-growth-mb", type=float, default=32.0)
+    parser.add_argument("--report-every", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for i in range(args.warmup):
+        decide(facts_for(i), mode=args.mode)
+    baseline = rss_bytes()
+    peak = baseline
+    start = time.perf_counter()
+    print(f"warmup={args.warmup} baseline_rss={baseline / 2**20:.1f}MB")
+    if PEAK_RSS_ONLY:
+        print("warning: /proc/self/statm unavailable, measuring peak RSS (ru_maxrss); flatness check is weaker")
+
+    for i in range(1, args.iterations + 1):
+        decide(facts_for(i), mode=args.mode)
+        if i % args.report_every == 0:
+            rss = rss_bytes()
+            peak = max(peak, rss)
+            rate = i / (time.perf_counter() - start)
+            print(
+                f"iter={i} rss={rss / 2**20:.1f}MB growth={(rss - baseline) / 2**20:+.1f}MB "
+                f"recycled={verifier.recycled} rate={rate:.0f}/s"
+            )
+
+    growth_mb = (max(peak, rss_bytes()) - baseline) / 2**20
+    print(f"done: peak_growth={growth_mb:+.1f}MB recycled={verifier.recycled}")
+    if growth_mb > args.max_growth_mb:
+        sys.exit(f"FAIL: RSS grew {growth_mb:.1f}MB (limit {args.max_growth_mb}MB)")
+
+
+if __name__ == "__main__":
+    main()
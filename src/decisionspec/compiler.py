@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Callable, Dict, List, Tuple, Optional
 from z3 import (
+    Context,
     Solver,
     Bool,
     BoolVal,
@@ -19,6 +20,7 @@ from z3 import (
     Sum,
     If,
     is_true,
+    sat,
 )
 
 from .dsl_schema import validate_minimal
@@ -77,14 +79,19 @@ def _build_eval_env(vars_map: Dict[str, Z3Var], constants: Dict[str, Any]) -> Di
     return env
 
 
-def compile(spec: Dict[str, Any]) -> Callable[[Dict[str, Any], Optional[str]], Tuple[Solver, Dict[str, Any]]]:
-    """Compile DecisionSpec dict to a callable: (facts, forced_action?) -> (Solver, meta).
+def compile(spec: Dict[str, Any]) -> Callable[..., Tuple[Solver, Dict[str, Any]]]:
+    """Compile DecisionSpec dict to a callable: (facts, forced_action?, ctx?, declared?) -> (Solver, meta).
+
+    All Z3 terms are created in ``ctx`` (Z3's global context when omitted), so a
+    caller that owns a private context can drop every per-request object by
+    discarding that context. ``declared`` is the result of
+    ``compiled.declare(ctx)``; pass it to reuse variables across calls on ``ctx``.
 
     meta contains:
       - vars: List[str]
       - invariants: List[str]
       - unsat_core_names: () -> List[str]
-      - chosen_action: (model) -> Optional[str]
+      - chosen_action: (model) -> Optional[str], first admissible action in policy order
       - val_of: (model, var_name) -> python value
       - z3_vars: Dict[str, Z3Var]
     """
@@ -99,27 +106,39 @@ def compile(spec: Dict[str, Any]) -> Callable[[Dict[str, Any], Optional[str]], T
     actions = spec.get("actions", []) or []
     one_hot = bool(spec.get("one_hot_actions", False))
 
-    # Predeclare all Z3 vars and action flags
-    z3_vars: Dict[str, Z3Var] = {}
-    for v in reals:
-        z3_vars[v] = Real(v)
-    for v in ints:
-        z3_vars[v] = Int(v)
-    for v in bools:
-        z3_vars[v] = Bool(v)
+    # Z3 vars and action flags are declared per context. Nothing is cached here:
+    # callers that reuse a context (one per worker) hold on to the declarations
+    # next to it and pass them back in, so a recycled context is freed with them.
+    def declare(ctx: Optional[Context] = None) -> Tuple[Dict[str, Z3Var], Dict[str, BoolRef]]:
+        z3_vars: Dict[str, Z3Var] = {}
+        for v in reals:
+            z3_vars[v] = Real(v, ctx)
+        for v in ints:
+            z3_vars[v] = Int(v, ctx)
+        for v in bools:
+            z3_vars[v] = Bool(v, ctx)
+
+        action_flags: Dict[str, BoolRef] = {}
+        for a in actions:
+            nm = a["name"]
+            action_flags[nm] = Bool(nm, ctx)
 
-    action_flags: Dict[str, BoolRef] = {}
-    for a in actions:
-        nm = a["name"]
-        action_flags[nm] = Bool(nm)
+        return z3_vars, action_flags
 
     # Helpers
     def parse_expr(expr: str, env: Dict[str, Any]):
-        # Safe-ish eval: no builtins, controlled env only
-        return eval(expr, {"__builtins__": {}}, env)
-
-    def compiled(facts: Dict[str, Any], forced_action: Optional[str] = None) -> Tuple[Solver, Dict[str, Any]]:
-        s = Solver()
+        # Safe-ish eval: env is the globals dict (so comprehensions in
+        # expressions can see it) and carries an empty __builtins__
+        return eval(expr, env)
+
+    def compiled(
+        facts: Dict[str, Any],
+        forced_action: Optional[str] = None,
+        ctx: Optional[Context] = None,
+        declared: Optional[Tuple[Dict[str, Z3Var], Dict[str, BoolRef]]] = None,
+    ) -> Tuple[Solver, Dict[str, Any]]:
+        z3_vars, action_flags = declared if declared is not None else declare(ctx)
+        s = Solver(ctx=ctx)
         s.set(unsat_core=True)
 
         # Bind facts to variables
@@ -129,15 +148,16 @@ def compile(spec: Dict[str, Any]) -> Callable[[Dict[str, Any], Optional[str]], T
                 continue
             val = facts[name]
             if isinstance(var, BoolRef):
-                s.add(var == BoolVal(bool(val)))
+                s.add(var == BoolVal(bool(val), ctx))
             elif name in ints:
-                s.add(var == IntVal(int(val)))
+                s.add(var == IntVal(int(val), ctx))
             else:
                 # Real
-                s.add(var == RealVal(float(val)))
+                s.add(var == RealVal(float(val), ctx))
 
-        # Build env for expressions
+        # Build env for expressions once per call; it doubles as eval globals
         env = _build_eval_env({**z3_vars, **action_flags}, constants)
+        env["__builtins__"] = {}
 
         # Invariants with named assumptions
         inv_names: List[str] = []
@@ -164,15 +184,18 @@ def compile(spec: Dict[str, Any]) -> Callable[[Dict[str, Any], Optional[str]], T
         if forced_action:
             if forced_action not in action_flags:
                 # If unknown action requested, make problem UNSAT via impossible constraint
-                s.add(Bool("__invalid_forced_action__") == BoolVal(False))
+                s.add(Bool("__invalid_forced_action__", ctx) == BoolVal(False, ctx))
             else:
                 s.add(action_flags[forced_action])
 
         # Meta accessors
         def chosen_action(model) -> Optional[str]:
+            # When several actions are admissible the solver may pick any of them,
+            # depending on internal term ids. Resolve in policy order instead so
+            # the same facts always yield the same action.
             for nm, flag in action_flags.items():
                 try:
-                    if is_true(model.eval(flag, model_completion=True)):
+                    if is_true(model.eval(flag, model_completion=True)) or s.check(flag) == sat:
                         return nm
                 except Exception:
                     continue
@@ -197,4 +220,5 @@ def compile(spec: Dict[str, Any]) -> Callable[[Dict[str, Any], Optional[str]], T
 
         return s, meta
 
+    compiled.declare = declare
     return compiled
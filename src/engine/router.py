@@ -17,7 +17,11 @@ with open(_POLICY_PATH, "r") as f:
     _spec = yaml.safe_load(f)
 
 _compiled = compile_spec(_spec)
-verifier = Verifier(_compiled)
+verifier = Verifier(
+    _compiled,
+    recycle_after=int(os.environ.get("Z3_RECYCLE_AFTER") or 10_000),
+    recycle_bytes=int(os.environ.get("Z3_RECYCLE_BYTES") or 64 * 1024 * 1024),
+)
 
 
 def _pack(decision: str, proof: Dict[str, Any], explanation: str) -> Dict[str, Any]:
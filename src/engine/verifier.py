@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Literal, TypedDict
-from z3 import Solver, sat
+import threading
+from typing import Dict, List, Optional, Literal, Tuple, TypedDict
+from z3 import Context, Solver, sat, Z3_get_estimated_alloc_size
 
 
 Decision = Literal["approve_no_otp", "approve_with_otp", "decline"]
@@ -16,29 +17,67 @@ class VerifyResult(TypedDict):
 
 
 class Verifier:
-    def __init__(self, compiled_policy):
-        # compiled_policy: (facts, forced_action?) -> (Solver, meta)
+    def __init__(
+        self,
+        compiled_policy,
+        recycle_after: int = 10_000,
+        recycle_bytes: int = 64 * 1024 * 1024,
+    ):
+        # compiled_policy: (facts, forced_action?, ctx?, declared?) -> (Solver, meta)
         self.compiled = compiled_policy
+        # Each worker thread owns a private Z3 context (and the policy variables
+        # declared in it) which is dropped and replaced after `recycle_after`
+        # checks, or once Z3's allocator has grown by `recycle_bytes` since the
+        # context was created (0 disables a limit). Z3 only reports process-wide
+        # allocation, so with several workers the byte limit counts their
+        # allocations together and any of them may trigger a recycle.
+        self.recycle_after = recycle_after
+        self.recycle_bytes = recycle_bytes
+        self.recycled = 0
+        self._recycled_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _context(self) -> Tuple[Context, Tuple]:
+        local = self._local
+        if getattr(local, "ctx", None) is not None:
+            over_count = self.recycle_after and local.checks >= self.recycle_after
+            over_bytes = self.recycle_bytes and Z3_get_estimated_alloc_size() - local.base_bytes >= self.recycle_bytes
+            if not (over_count or over_bytes):
+                local.checks += 1
+                return local.ctx, local.declared
+            # Release the old context before measuring the new baseline
+            local.ctx = local.declared = None
+            with self._recycled_lock:
+                self.recycled += 1
+        local.base_bytes = Z3_get_estimated_alloc_size()
+        local.ctx = Context()
+        local.declared = self.compiled.declare(local.ctx)
+        local.checks = 1
+        return local.ctx, local.declared
 
     def check(self, facts: Dict, forced_action: Optional[str] = None) -> VerifyResult:
         s: Solver
-        s, meta = self.compiled(facts, forced_action)
-        result = s.check()
-        if result == sat:
-            m = s.model()
-            return {
-                "satisfiable": True,
-                "chosen_action": meta["chosen_action"](m),
-                "model": {k: meta["val_of"](m, k) for k in meta["vars"]},
-                "checked_invariants": meta["invariants"],
-                "unsat_core": [],
-            }
-        else:
-            return {
-                "satisfiable": False,
-                "chosen_action": None,
-                "model": {},
-                "checked_invariants": meta["invariants"],
-                "unsat_core": meta["unsat_core_names"](),
-            }
-
+        ctx, declared = self._context()
+        s, meta = self.compiled(facts, forced_action, ctx, declared)
+        try:
+            # Results hold plain Python values only; the solver, model and the
+            # closures in meta are released before returning.
+            if s.check() == sat:
+                m = s.model()
+                return {
+                    "satisfiable": True,
+                    "chosen_action": meta["chosen_action"](m),
+                    "model": {k: meta["val_of"](m, k) for k in meta["vars"]},
+                    "checked_invariants": list(meta["invariants"]),
+                    "unsat_core": [],
+                }
+            else:
+                return {
+                    "satisfiable": False,
+                    "chosen_action": None,
+                    "model": {},
+                    "checked_invariants": list(meta["invariants"]),
+                    "unsat_core": meta["unsat_core_names"](),
+                }
+        finally:
+            meta.clear()
@@ -0,0 +1,51 @@
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import yaml
+from z3 import AstRef, ModelRef
+
+from decisionspec.compiler import compile as compile_spec
+from engine.verifier import Verifier
+
+
+with open(os.path.join(SRC_DIR, "policies", "auth_v1.yaml")) as f:
+    _spec = yaml.safe_load(f)
+
+APPROVE = {"amount": 100.0, "avail": 1000.0, "limit": 5000.0, "risk": 0.2, "vel1h": 1, "mcc": 5411, "cnp": False}
+DECLINE = {"amount": 200.0, "avail": 1000.0, "limit": 5000.0, "risk": 0.7, "vel1h": 1, "mcc": 5999, "cnp": True}
+
+
+def test_context_recycled_after_n_checks():
+    v = Verifier(compile_spec(_spec), recycle_after=3, recycle_bytes=0)
+    for _ in range(3):
+        v.check(APPROVE)
+    assert v.recycled == 0
+    for _ in range(4):
+        v.check(APPROVE)
+    assert v.recycled == 2
+
+
+def test_same_facts_same_action_on_one_context():
+    v = Verifier(compile_spec(_spec), recycle_after=0, recycle_bytes=0)
+    actions = {v.check(APPROVE)["chosen_action"] for _ in range(200)}
+    assert actions == {"approve_no_otp"}
+    assert v.recycled == 0
+
+
+def test_results_stable_across_recycling_and_plain_python():
+    v = Verifier(compile_spec(_spec), recycle_after=7, recycle_bytes=0)
+    for _ in range(20):
+        ok = v.check(APPROVE)
+        bad = v.check(DECLINE)
+        assert ok["chosen_action"] == "approve_no_otp"
+        assert not bad["satisfiable"]
+        assert "cnp_tightened" in bad["unsat_core"]
+        for res in (ok, bad):
+            for val in list(res["model"].values()) + res["unsat_core"] + res["checked_invariants"]:
+                assert not isinstance(val, (AstRef, ModelRef))
+    assert v.recycled >= 5